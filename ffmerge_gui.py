@@ -13,37 +13,55 @@ FFmerge 图形界面（Python + Tkinter）
 """
 
 import os
-import shlex
+import queue
+import re
+import shutil
 import subprocess
 import sys
-from datetime import datetime
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import json
 
 # ---- Optional DnD support ----
+# 延迟到 main() 中导入，缩短启动时间
 DnD_AVAILABLE = False
-try:
-    # pip install tkinterdnd2
-    from tkinterdnd2 import DND_FILES, TkinterDnD
-    DnD_AVAILABLE = True
-except Exception:
-    DnD_AVAILABLE = False
+DND_FILES = TkinterDnD = None
 
-AUDIO_EXTS = {'.aac', '.m4a', '.mp3', '.wav', '.flac', '.ogg', '.opus', '.wma', '.ac3'}
-VIDEO_EXTS = {'.mp4', '.mkv', '.mov', '.webm', '.m4v', '.avi', '.ts'}
+def _try_import_dnd():
+    global DnD_AVAILABLE, DND_FILES, TkinterDnD
+    try:
+        # pip install tkinterdnd2
+        from tkinterdnd2 import DND_FILES, TkinterDnD
+        DnD_AVAILABLE = True
+    except Exception:
+        DnD_AVAILABLE = False
+    return DnD_AVAILABLE
+
+# 扩展名不含点号，配合 file_ext() 使用
+AUDIO_EXTS = frozenset({'aac', 'm4a', 'mp3', 'wav', 'flac', 'ogg', 'opus', 'wma', 'ac3'})
+VIDEO_EXTS = frozenset({'mp4', 'mkv', 'mov', 'webm', 'm4v', 'avi', 'ts'})
+# 扩展名 -> 角色（0 音频 / 1 视频），拖放时一次查表即可分类
+ROLE_AUDIO, ROLE_VIDEO = 0, 1
+EXT_ROLE = {e: ROLE_AUDIO for e in AUDIO_EXTS}
+EXT_ROLE.update({e: ROLE_VIDEO for e in VIDEO_EXTS})
+
+# 拖放数据：{带空格的路径}、"带引号的路径" 或普通路径，以空白分隔
+_DND_RE = re.compile(r'\{([^}]*)\}|"([^"]*)"|(\S+)')
+
+# PATH 在导入时解析一次；Windows 下条目可能带引号，需去掉
+_PATH_DIRS = tuple(p.strip('"') for p in os.environ.get('PATH', '').split(os.pathsep) if p)
 
 def timestamp():
-    return datetime.now().strftime('%Y%m%d_%H%M%S')
+    return time.strftime('%Y%m%d_%H%M%S')
 
 def which_ffmpeg():
     # 在 PATH 中查找 ffmpeg；Windows 下也会尝试当前目录
     exe = 'ffmpeg.exe' if os.name == 'nt' else 'ffmpeg'
-    # 1) PATH
-    for p in os.environ.get('PATH', '').split(os.pathsep):
-        candidate = os.path.join(p.strip('"'), exe)
-        if os.path.isfile(candidate):
-            return candidate
+    # 1) PATH（shutil.which 在 Windows 下会考虑 PATHEXT）
+    found = shutil.which('ffmpeg', path=os.pathsep.join(_PATH_DIRS))
+    if found:
+        return found
     # 2) Same directory as script
     here = os.path.dirname(os.path.abspath(sys.argv[0]))
     local = os.path.join(here, exe)
@@ -51,26 +69,47 @@ def which_ffmpeg():
         return local
     return exe  # let subprocess try; will error if not found
 
-def is_audio(path):
-    return os.path.splitext(path)[1].lower() in AUDIO_EXTS
+_DURATION_RE = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+_AUDIO_RE = re.compile(r'Stream #\d+:\d+\S*: Audio: (\w+)')
 
-def is_video(path):
-    return os.path.splitext(path)[1].lower() in VIDEO_EXTS
-
-def clean_quoted_win_path(s: str) -> str:
-    """在 Windows 中，拖放可能返回带大括号或引号的路径；此处做规范化。"""
-    s = s.strip()
-    if s.startswith('{') and s.endswith('}'):
-        s = s[1:-1]
-    if (s.startswith('"') and s.endswith('"')) or (s.startswith("'") and s.endswith("'")):
-        s = s[1:-1]
-    return s
+def probe_media(ffmpeg, path, **popen_kw):
+    """用 ffmpeg -i 读取媒体信息（无需 ffprobe），返回 {'duration': 秒或 None, 'audio_codec': 首条音轨编码或 None}。"""
+    info = {'duration': None, 'audio_codec': None}
+    try:
+        # 未指定输出文件时 ffmpeg 会打印输入信息后以非零状态退出，这里只解析 stderr
+        proc = subprocess.run([ffmpeg, '-hide_banner', '-nostdin', '-i', path],
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                              encoding='utf-8', errors='replace', shell=False, **popen_kw)
+    except Exception:
+        return info
+    m = _DURATION_RE.search(proc.stderr)
+    if m:
+        h, mnt, sec = m.groups()
+        info['duration'] = int(h) * 3600 + int(mnt) * 60 + float(sec)
+    m = _AUDIO_RE.search(proc.stderr)
+    if m:
+        info['audio_codec'] = m.group(1)
+    return info
+
+def unique_output(outdir):
+    # 同一秒内的多个任务追加序号，避免互相覆盖
+    base = timestamp()
+    outfile = os.path.join(outdir, f'{base}.mp4')
+    n = 1
+    while os.path.exists(outfile):
+        outfile = os.path.join(outdir, f'{base}_{n}.mp4')
+        n += 1
+    return outfile
+
+def file_ext(path):
+    # 比 os.path.splitext 更轻量；无扩展名时返回的内容不会命中任何集合
+    return path.rpartition('.')[2].lower()
 
 class App:
     def __init__(self, root):
         self.root = root
         root.title('FFmerge - 音视频合并')
-        root.geometry('700x300')
+        root.geometry('700x460')
         try:
             root.iconbitmap(default='')  # no icon by default
         except Exception:
@@ -82,6 +121,19 @@ class App:
         # 配置文件路径与读取
         self.config_path = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), 'ffmerge_gui_config.json')
         self.settings = self.load_settings()
+        self._save_job = None
+        root.protocol('WM_DELETE_WINDOW', self.on_close)
+
+        # ffmpeg 路径只解析一次；文件消失或启动失败时再重新查找
+        self.ffmpeg_path = which_ffmpeg()
+
+        # Windows：启动 ffmpeg 时不分配控制台窗口
+        self._popen_kw = {}
+        if os.name == 'nt':
+            si = subprocess.STARTUPINFO()
+            si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            si.wShowWindow = 0  # SW_HIDE
+            self._popen_kw = dict(creationflags=subprocess.CREATE_NO_WINDOW, startupinfo=si)
 
         # 行：音频
         self.audio_var = tk.StringVar()
@@ -119,9 +171,40 @@ class App:
         row4.pack(fill=tk.X, pady=(0,6))
         self.merge_btn = ttk.Button(row4, text='开始合并', command=self.merge_now)
         self.merge_btn.pack(side=tk.LEFT)
+        ttk.Button(row4, text='加入队列', command=self.enqueue_current).pack(side=tk.LEFT, padx=(8,0))
+        ttk.Button(row4, text='清除已完成', command=self.clear_finished).pack(side=tk.LEFT, padx=(8,0))
+        self.cancel_btn = ttk.Button(row4, text='取消', command=self.cancel_merge, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=(8,0))
+        # 仅 Windows 可由普通用户提高进程优先级；POSIX 需 root/CAP_SYS_NICE，故不显示
+        self.priority_var = tk.BooleanVar(value=False)
+        if os.name == 'nt':
+            ttk.Checkbutton(row4, text='提高优先级', variable=self.priority_var).pack(side=tk.LEFT, padx=(8,0))
         ttk.Label(row4, text=' 输出文件名 = yyyyMMdd_HHmmss.mp4').pack(side=tk.LEFT, padx=(12,0))
 
+        # 行：任务队列
+        self.jobs = queue.Queue()
+        self._results = []
+        self._input_job = None  # 由输入框直接提交的任务：(iid, audio, video)
+        self.job_list = ttk.Treeview(main, columns=('audio', 'video', 'status'), show='headings', height=5)
+        self.job_list.heading('audio', text='音频')
+        self.job_list.heading('video', text='视频')
+        self.job_list.heading('status', text='状态')
+        self.job_list.column('status', width=90, stretch=False)
+        self.job_list.pack(fill=tk.BOTH, expand=True, pady=(6,0))
+
+        # 行：进度
+        self.progress = ttk.Progressbar(main, mode='determinate', maximum=100)
+        self.progress.pack(fill=tk.X, pady=(6,0))
+
         # 行：状态
+        self._proc = None
+        self._worker = None
+        self._closing = False  # 窗口关闭中：工作线程不再回调 Tk
+        self._cancelled = False
+        self._busy = False
+        self._drain_job = None
+        self._progress_q = queue.Queue()
+        self._media = {}  # 媒体信息缓存：(path, mtime_ns, size) -> probe_media() 结果
         self.status_var = tk.StringVar(value='就绪。')
         status = ttk.Label(main, textvariable=self.status_var, foreground='#555')
         status.pack(fill=tk.X, pady=(6,0))
@@ -179,15 +262,10 @@ class App:
 
     # --- 拖放处理 ---
     def parse_dnd_list(self, data: str):
-        # 数据可能包含多个文件，使用空格分隔，且每个可能被 {} 包裹
-        # 使用 shlex 在 Windows 下也能正确按引号/括号分割
-        # 先将 {...} 转为 "..." 以便 shlex 解析
-        normalized = data.replace('{', '"').replace('}', '"')
-        try:
-            items = shlex.split(normalized)
-        except Exception:
-            items = [data]
-        return [clean_quoted_win_path(i) for i in items]
+        # 数据可能包含多个文件，使用空格分隔，且每个可能被 {} 或引号包裹
+        # 预编译正则一次扫描完成切分，不依赖 shlex（避免 Windows 反斜杠转义问题）
+        items = (next(filter(None, m), '') for m in _DND_RE.findall(data))
+        return [i for i in items if i]
 
     def on_drop_audio(self, event):
         files = self.parse_dnd_list(event.data)
@@ -210,23 +288,39 @@ class App:
 
     def on_drop_any(self, event):
         # Heuristic: if two files dropped, map by extension; if one, fill first empty slot by type
-        files = self.parse_dnd_list(event.data)
+        dirs, files = [], []
+        for f in self.parse_dnd_list(event.data):
+            (dirs if os.path.isdir(f) else files).append(f)
+        # 先处理目录：输出目录为空或已失效时，使用拖入的第一个目录
+        outdir = self.outdir_var.get().strip('" ')
+        if dirs and not os.path.isdir(outdir):
+            self.outdir_var.set(dirs[0])
+            self.save_outdir(dirs[0])
         if not files:
             return
-        aud_set = False
-        vid_set = False
-        for f in files:
-            if os.path.isdir(f):
-                # set output dir if empty
-                if not self.outdir_var.get():
-                    self.outdir_var.set(f)
-                    self.save_outdir(f)
-                continue
-            ext = os.path.splitext(f)[1].lower()
-            if is_audio(f) and not self.audio_var.get():
-                self.audio_var.set(f); aud_set = True; continue
-            if is_video(f) and not self.video_var.get():
-                self.video_var.set(f); vid_set = True; continue
+        # 每个文件只查一次表：roles[i] 为 ROLE_AUDIO / ROLE_VIDEO / None
+        # 目录（即使名称形如 clips.mp4）已在上面排除，不参与分类
+        roles = [EXT_ROLE.get(file_ext(f)) for f in files]
+        audios = sorted(f for f, role in zip(files, roles) if role == ROLE_AUDIO)
+        videos = sorted(f for f, role in zip(files, roles) if role == ROLE_VIDEO)
+        # 批量：多组音视频按文件名排序后一一配对加入队列
+        if audios and videos and (len(audios) > 1 or len(videos) > 1):
+            outdir = self.outdir_var.get().strip('" ')
+            if not self.check_outdir(outdir):
+                return
+            for audio, video in zip(audios, videos):
+                self.add_job(audio, video, outdir)
+            msg = f'已加入队列（{self.jobs.qsize()} 个待处理）。'
+            unpaired = abs(len(audios) - len(videos))
+            if unpaired:
+                msg += f'另有 {unpaired} 个文件未能配对，已忽略。'
+            self.status_var.set(msg)
+            return
+        for f, role in zip(files, roles):
+            if role == ROLE_AUDIO and not self.audio_var.get():
+                self.audio_var.set(f); continue
+            if role == ROLE_VIDEO and not self.video_var.get():
+                self.video_var.set(f); continue
         # If still empty, just assign first to audio, second to video
         if not self.audio_var.get():
             self.audio_var.set(files[0])
@@ -234,63 +328,287 @@ class App:
             self.video_var.set(files[1])
 
     # --- 合并逻辑 ---
-    def merge_now(self):
+    def collect_job(self):
+        """校验输入框，返回 (audio, video, outdir)；无效时提示并返回 None。"""
         audio = self.audio_var.get().strip('" ')
         video = self.video_var.get().strip('" ')
         outdir = self.outdir_var.get().strip('" ')
 
         if not audio or not os.path.isfile(audio):
             messagebox.showerror('错误', '请选择有效的音频文件。')
-            return
+            return None
         if not video or not os.path.isfile(video):
             messagebox.showerror('错误', '请选择有效的视频文件。')
-            return
+            return None
+        if not self.check_outdir(outdir):
+            return None
+        return audio, video, outdir
+
+    def check_outdir(self, outdir):
         if not outdir:
             messagebox.showerror('错误', '请选择输出目录。')
-            return
+            return False
         if not os.path.isdir(outdir):
             messagebox.showerror('错误', '输出目录不存在。')
+            return False
+        return True
+
+    def add_job(self, audio, video, outdir):
+        iid = self.job_list.insert('', tk.END, values=(os.path.basename(audio), os.path.basename(video), '等待'))
+        self.jobs.put((iid, audio, video, outdir))
+        return iid
+
+    def clear_finished(self):
+        # 只移除已结束的行；等待中/合并中的任务仍由工作线程更新
+        for iid in self.job_list.get_children():
+            if self.job_list.set(iid, 'status') not in ('等待', '合并中'):
+                self.job_list.delete(iid)
+
+    def enqueue_current(self):
+        job = self.collect_job()
+        if job is None:
             return
+        self.add_job(*job)
+        # Clear inputs for next job
+        self.audio_var.set('')
+        self.video_var.set('')
+        self.audio_entry.focus_set()
+        self.status_var.set(f'已加入队列（{self.jobs.qsize()} 个待处理）。')
 
-        ffmpeg = which_ffmpeg()
-        outfile = os.path.join(outdir, f'{timestamp()}.mp4')
+    def merge_now(self):
+        # 输入框有内容时先将其加入队列；否则直接处理已排队的任务
+        if self.audio_var.get().strip('" ') or self.video_var.get().strip('" ') or self.jobs.empty():
+            job = self.collect_job()
+            if job is None:
+                return
+            # 输入框在该任务成功后才清空，失败时可直接重试
+            self._input_job = (self.add_job(*job),) + job[:2]
+        if self._busy:
+            return
 
-        cmd = [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y', '-nostdin',
-               '-i', audio, '-i', video, '-acodec', 'copy', '-vcodec', 'copy', outfile]
+        if not (self.ffmpeg_path and os.path.isfile(self.ffmpeg_path)):
+            self.ffmpeg_path = which_ffmpeg()
 
         self.merge_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self._cancelled = False
+        self._busy = True
+        self._results = []
+        self.progress['value'] = 0
         self.status_var.set('正在合并...')
-        self.root.update_idletasks()
 
-        try:
-            # 仅捕获错误输出
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, shell=False)
-            if proc.returncode != 0 or not os.path.exists(outfile) or os.path.getsize(outfile) == 0:
-                err = proc.stderr.strip() or proc.stdout.strip() or 'Unknown error.'
-                messagebox.showerror('合并失败', err)
-                self.status_var.set('失败。')
+        self.start_worker()
+        # 进度轮询只在批次开始时启动一次；_batch_done 重启工作线程时沿用
+        if self._drain_job is not None:
+            self.root.after_cancel(self._drain_job)
+        self._drain_job = self.root.after(100, self._drain_queue)
+
+    def start_worker(self):
+        # 在后台线程中依次处理队列，避免阻塞界面
+        # Tk 变量只在主线程读取，结果作为参数传给工作线程
+        popen_kw = self._popen_kw
+        if self.priority_var.get() and os.name == 'nt':
+            popen_kw = dict(popen_kw, creationflags=popen_kw['creationflags'] | subprocess.ABOVE_NORMAL_PRIORITY_CLASS)
+        args = (self.ffmpeg_path, popen_kw)
+        self._worker = threading.Thread(target=self._run_jobs, args=args, daemon=True)
+        self._worker.start()
+
+    def _run_jobs(self, ffmpeg, popen_kw):
+        # 工作线程：不得直接访问 Tk 变量，结果通过 root.after 回到主线程
+        while not self._cancelled:
+            try:
+                iid, audio, video, outdir = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            outfile = unique_output(outdir)
+            # -progress pipe:1 将进度以 key=value 形式输出到 stdout
+            # 显式 -map 跳过自动选流
+            cmd = [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y', '-nostdin',
+                   '-progress', 'pipe:1', '-nostats',
+                   '-i', video, '-i', audio,
+                   '-map', '0:v:0', '-map', '1:a:0', '-c', 'copy', '-shortest']
+            # MP4 原生音频编码：将 moov 前置，输出可边下边播
+            if self.media_info(ffmpeg, audio)['audio_codec'] in ('aac', 'mp3'):
+                cmd += ['-movflags', '+faststart']
+            cmd.append(outfile)
+            self._progress_q.put(0.0)
+            self._post(self._job_started, iid)
+            rc, err = self._run_ffmpeg(cmd, (video, audio), popen_kw)
+            if self._closing:
+                # 窗口已关闭：由工作线程自行删除未完成的输出文件
+                try:
+                    if os.path.exists(outfile):
+                        os.remove(outfile)
+                except OSError:
+                    pass
                 return
+            self._post(self._job_done, iid, rc, err, outfile)
+            if err is FileNotFoundError:
+                break
+        self._post(self._batch_done)
+
+    def _post(self, func, *args):
+        # 工作线程 -> 主线程；窗口销毁后不再调用 Tk
+        if self._closing:
+            return
+        try:
+            self.root.after(0, func, *args)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def media_info(self, ffmpeg, path):
+        # 结果按 (路径, 修改时间, 大小) 缓存：重试时不再重复探测，同名文件被替换后重新探测
+        try:
+            st = os.stat(path)
+            key = (path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        if key in self._media:
+            return self._media[key]
+        info = probe_media(ffmpeg, path, **self._popen_kw)
+        # 探测失败（如 ffmpeg 缺失）不缓存，安装后重试可重新获取
+        if key is not None and (info['duration'] is not None or info['audio_codec'] is not None):
+            self._media[key] = info
+        return info
+
+    def _run_ffmpeg(self, cmd, inputs, popen_kw):
+        try:
+            # -shortest 按较短的输入截断，进度也以较短者为准
+            known = [d for d in (self.media_info(cmd[0], p)['duration'] for p in inputs) if d]
+            duration = min(known) if known else None
+            # 探测期间 _proc 为空，取消按钮无进程可终止；启动前后各检查一次
+            if self._cancelled:
+                return None, None
+            proc = self._proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                                 bufsize=1, text=True, encoding='utf-8', errors='replace',
+                                                 shell=False, **popen_kw)
+            if self._cancelled:
+                proc.terminate()
+            # 另起线程读取 stderr，避免错误输出写满管道后 ffmpeg 阻塞、不再输出进度
+            err_lines = []
+            err_reader = threading.Thread(target=lambda: err_lines.extend(proc.stderr), daemon=True)
+            err_reader.start()
+            for line in proc.stdout:
+                key, _, value = line.strip().partition('=')
+                if key == 'out_time_us' and duration:
+                    try:
+                        self._progress_q.put(min(int(value) / 1e6 / duration, 1.0))
+                    except ValueError:
+                        pass
+                elif key == 'progress' and value == 'end':
+                    self._progress_q.put(1.0)
+            rc = proc.wait()
+            err_reader.join()
+            return rc, ''.join(err_lines).strip()
         except FileNotFoundError:
+            return None, FileNotFoundError
+        except Exception as e:
+            return None, e
+        finally:
+            self._proc = None
+
+    def _drain_queue(self):
+        # 主线程：读取工作线程推送的进度；直接调用时取消尚未触发的轮询，保证只有一个循环
+        if self._drain_job is not None:
+            self.root.after_cancel(self._drain_job)
+            self._drain_job = None
+        try:
+            while True:
+                self.progress['value'] = self._progress_q.get_nowait() * 100
+        except queue.Empty:
+            pass
+        if self._busy:
+            self._drain_job = self.root.after(100, self._drain_queue)
+
+    def _job_started(self, iid):
+        self.job_list.set(iid, 'status', '合并中')
+        self.status_var.set(f'正在合并：{self.job_list.set(iid, "video")}')
+
+    def _job_done(self, iid, rc, err, outfile):
+        if err is FileNotFoundError:
+            self.ffmpeg_path = None
+            self.job_list.set(iid, 'status', '未找到 ffmpeg')
+            self._results.append((False, err))
+            return
+        if isinstance(err, Exception):
+            self.job_list.set(iid, 'status', '错误')
+            self._results.append((False, str(err)))
+            return
+        if self._cancelled and rc != 0:
+            # 进程确实被终止：删除未完成的输出文件
+            # （ffmpeg 已正常结束后才点击取消时按成功处理）
+            try:
+                if os.path.exists(outfile):
+                    os.remove(outfile)
+            except OSError:
+                pass
+            self.job_list.set(iid, 'status', '已取消')
+            self._results.append((None, outfile))
+            return
+        if rc != 0 or not os.path.exists(outfile) or os.path.getsize(outfile) == 0:
+            self.job_list.set(iid, 'status', '失败')
+            self._results.append((False, err or 'Unknown error.'))
+            return
+        self.job_list.set(iid, 'status', '成功')
+        self._results.append((True, outfile))
+        # Clear inputs for next run（仅当输入框仍是该任务的文件时）
+        if self._input_job and self._input_job[0] == iid:
+            if (self.audio_var.get().strip('" '), self.video_var.get().strip('" ')) == self._input_job[1:]:
+                self.audio_var.set('')
+                self.video_var.set('')
+            self._input_job = None
+
+    def _batch_done(self):
+        # 工作线程退出与新任务入队之间可能存在竞争，此处补处理
+        if not self._cancelled and not self.jobs.empty() and \
+                not any(r is FileNotFoundError for _, r in self._results):
+            self.start_worker()
+            return
+
+        self._busy = False
+        self._drain_queue()
+        self.merge_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+
+        results = self._results
+        ok = [r for good, r in results if good]
+        failed = [r for good, r in results if good is False]
+        if FileNotFoundError in failed:
             messagebox.showerror('未找到 ffmpeg', '未找到 ffmpeg 可执行文件。\n请将 ffmpeg.exe 放在本脚本同目录，或添加到 PATH。')
             self.status_var.set('未找到 ffmpeg。')
             return
-        except Exception as e:
-            messagebox.showerror('错误', str(e))
-            self.status_var.set('错误。')
+        # 仅当确有任务被终止或跳过时才显示“已取消”
+        if self._cancelled and (not results or not self.jobs.empty() or
+                                any(good is None for good, _ in results)):
+            self.status_var.set('已取消。')
             return
-        finally:
-            self.merge_btn.config(state=tk.NORMAL)
-
-        # Success
-        self.status_var.set(f'成功：{outfile}')
-        messagebox.showinfo('完成', f'合并成功：\n{outfile}')
-        # Clear inputs for next run
-        self.audio_var.set('')
-        self.video_var.set('')
+        if len(results) == 1:
+            if failed:
+                messagebox.showerror('合并失败', failed[0])
+                self.status_var.set('失败。')
+                return
+            # Success
+            self.status_var.set(f'成功：{ok[0]}')
+            messagebox.showinfo('完成', f'合并成功：\n{ok[0]}')
+            self.audio_entry.focus_set()
+            return
+        self.status_var.set(f'完成：成功 {len(ok)} 个，失败 {len(failed)} 个。')
+        if failed:
+            messagebox.showerror('合并失败', f'{len(failed)} 个任务失败，首个错误：\n{failed[0]}')
+        else:
+            messagebox.showinfo('完成', f'全部 {len(ok)} 个任务合并成功。')
         self.audio_entry.focus_set()
 
+    def cancel_merge(self):
+        # 终止当前任务并停止处理队列；剩余任务保留，可再次开始
+        self._cancelled = True
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+
     # --- 设置持久化 ---
     def load_settings(self):
+        import json
         try:
             if os.path.isfile(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
@@ -300,27 +618,59 @@ class App:
         return {}
 
     def save_outdir(self, path: str):
+        # self.settings 为唯一数据源；未变化时不写盘
+        settings = self.settings if isinstance(self.settings, dict) else {}
+        if settings.get('outdir') == path:
+            return
+        settings['outdir'] = path
+        self.settings = settings
+        # 500ms 内的多次修改合并为一次写入
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+        self._save_job = self.root.after(500, self.write_settings)
+
+    def write_settings(self):
+        import json
+        self._save_job = None
         try:
-            settings = self.settings if isinstance(self.settings, dict) else {}
-            settings['outdir'] = path
-            self.settings = settings
             with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+                json.dump(self.settings, f, ensure_ascii=False, indent=2)
         except Exception:
             pass
 
+    def on_close(self):
+        # 合并进行中时终止 ffmpeg；未完成的输出文件由工作线程删除
+        self._closing = True
+        self._cancelled = True
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        # 等待工作线程完成清理（进程刚启动尚未登记时，它会自行终止并删除输出）
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+        # 退出前写入尚未落盘的设置
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+            self.write_settings()
+        self.root.destroy()
+
 def main():
     # Use TkinterDnD.Tk if available, else tk.Tk
-    if DnD_AVAILABLE:
+    if _try_import_dnd():
         root = TkinterDnD.Tk()
     else:
         root = tk.Tk()
     # Modern ttk theme if possible
     try:
         style = ttk.Style(root)
-        if 'vista' in style.theme_names():
+        names = set(style.theme_names())  # 只查询一次主题列表
+        if 'vista' in names:
             style.theme_use('vista')
-        elif 'clam' in style.theme_names():
+        elif 'clam' in names:
             style.theme_use('clam')
     except Exception:
         pass